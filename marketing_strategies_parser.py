@@ -5,13 +5,67 @@ Parses marketing strategies from HTML file and outputs to JSON format.
 Extracts strategy name, description, and funnel step types.
 """
 
-import json
 import re
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any
-
-
-def parse_marketing_strategies(html_file_path: str) -> List[Dict[str, Any]]:
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+from typing import List, Optional
+
+from marketing_strategy import Strategy, json_dumps
+
+# Prefer the C-backed lxml builder; fall back to the stdlib parser if missing
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Class fingerprints of the strategy card elements
+CONTAINER_CLASS_RE = re.compile(re.escape('flex flex-col gap-3 rounded-'))
+NAME_CLASS_RE = re.compile('^' + re.escape('text-sm font-semibold') + '$')
+DESCRIPTION_CLASS_RE = re.compile(re.escape('text-xs font-normal text-[#5A6A72]'))
+FUNNEL_STEP_CLASS_RE = re.compile(re.escape('px-[0.35rem] py-[0.22rem] bg-[#D0E6FB]'))
+EFFORT_CLASS_RE = re.compile(r'^(?=.*hours).*' + re.escape('text-[#5A6A72]'))
+IMPACT_CLASS_RE = re.compile(re.escape('bg-[#FFEEBE] text-[#AE8309]'))
+
+# Card fields keyed by tag name, matched in a single walk over each container
+FIELD_MATCHERS = {
+    'h3': (('name', NAME_CLASS_RE),),
+    'p': (
+        ('description', DESCRIPTION_CLASS_RE),
+        ('funnel_step', FUNNEL_STEP_CLASS_RE),
+        ('effort', EFFORT_CLASS_RE),
+    ),
+    'span': (('impact', IMPACT_CLASS_RE),),
+}
+
+
+def _element_text(elem) -> str:
+    """Return stripped element text, skipping the get_text join for leaf elements."""
+    # Only plain text nodes take the shortcut; comments and other
+    # NavigableString subclasses are ignored by get_text
+    string = elem.string
+    if type(string) is NavigableString:
+        return string.strip()
+    return elem.get_text(strip=True)
+
+
+def _parse_effort_hours(text: str) -> Optional[int]:
+    """Return N from the first 'N hour(s)' in text, or None if there is none."""
+    hour_pos = text.find('hour')
+    while hour_pos != -1:
+        # Step back over whitespace, then over the digits preceding it
+        digits_end = hour_pos
+        while digits_end > 0 and text[digits_end - 1].isspace():
+            digits_end -= 1
+        digits_start = digits_end
+        while digits_start > 0 and text[digits_start - 1].isdecimal():
+            digits_start -= 1
+        if digits_start < digits_end:
+            return int(text[digits_start:digits_end])
+        hour_pos = text.find('hour', hour_pos + 4)
+    return None
+
+
+def parse_marketing_strategies(html_file_path: str) -> List[Strategy]:
     """
     Parse marketing strategies from HTML file.
 
@@ -19,74 +73,77 @@ def parse_marketing_strategies(html_file_path: str) -> List[Dict[str, Any]]:
         html_file_path: Path to the HTML file containing marketing strategies
 
     Returns:
-        List of dictionaries containing strategy information
+        List of parsed strategies
     """
-    # Read the HTML file
-    with open(html_file_path, 'r', encoding='utf-8') as file:
-        html_content = file.read()
+    # Each strategy is in a div with specific classes; only those subtrees are built
+    strainer = SoupStrainer('div', class_=CONTAINER_CLASS_RE)
 
-    # Parse HTML with BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Parse HTML with BeautifulSoup straight from the binary file, so the raw
+    # bytes are released once the tree is built; the encoding is passed
+    # explicitly so it does not have to sniff it
+    with open(html_file_path, 'rb') as file:
+        soup = BeautifulSoup(file, HTML_PARSER, parse_only=strainer,
+                             from_encoding='utf-8')
 
     strategies = []
 
     # Find all strategy containers
-    # Each strategy is in a div with specific classes
-    strategy_containers = soup.find_all('div', class_=lambda x: x and 'flex flex-col gap-3 rounded-' in x)
+    strategy_containers = soup.find_all('div', class_=CONTAINER_CLASS_RE)
 
+    skipped = 0
     for container in strategy_containers:
-        try:
-            # Extract strategy name
-            name_elem = container.find('h3', class_='text-sm font-semibold')
-            if not name_elem:
+        # Classify the container's elements in one pass (first match wins,
+        # except funnel steps which are all collected)
+        field_elems = {}
+        funnel_elems = []
+        for elem in container.descendants:
+            matchers = FIELD_MATCHERS.get(elem.name)
+            if not matchers or not elem.get('class'):
                 continue
-
-            strategy_name = name_elem.get_text(strip=True)
-
-            # Extract description
-            desc_elem = container.find('p', class_=lambda x: x and 'text-xs font-normal text-[#5A6A72]' in x)
-            description = desc_elem.get_text(strip=True) if desc_elem else ""
-
-            # Extract funnel steps/types
-            funnel_steps = []
-            funnel_elems = container.find_all('p', class_=lambda x: x and 'px-[0.35rem] py-[0.22rem] bg-[#D0E6FB]' in x)
-
-            for elem in funnel_elems:
-                step_text = elem.get_text(strip=True)
-                if step_text and step_text != '+1':  # Skip the +1 indicators
-                    funnel_steps.append(step_text)
-
-            # Extract effort hours (optional metadata)
-            effort_elem = container.find('p', class_=lambda x: x and 'text-[#5A6A72]' in x and 'hours' in x)
-            effort_hours = None
-            if effort_elem:
-                hours_match = re.search(r'(\d+)\s*hours?', effort_elem.get_text(strip=True))
-                if hours_match:
-                    effort_hours = int(hours_match.group(1))
-
-            # Extract impact level (optional metadata)
-            impact_elem = container.find('span', class_=lambda x: x and 'bg-[#FFEEBE] text-[#AE8309]' in x)
-            impact = impact_elem.get_text(strip=True) if impact_elem else None
-
-            # Create strategy dictionary
-            strategy = {
-                'name': strategy_name,
-                'description': description,
-                'types': funnel_steps
-            }
-
-            # Add optional metadata if available
-            if effort_hours is not None:
-                strategy['effort_hours'] = effort_hours
-            if impact:
-                strategy['impact'] = impact
-
-            strategies.append(strategy)
-
-        except Exception as e:
-            print(f"Error parsing strategy: {e}")
+            class_str = ' '.join(elem['class'])
+            for field, class_re in matchers:
+                if class_re.search(class_str):
+                    if field == 'funnel_step':
+                        funnel_elems.append(elem)
+                    else:
+                        field_elems.setdefault(field, elem)
+
+        # Extract strategy name
+        name_elem = field_elems.get('name')
+        if not name_elem:
+            skipped += 1
             continue
 
+        strategy_name = _element_text(name_elem)
+
+        # Extract description
+        desc_elem = field_elems.get('description')
+        description = _element_text(desc_elem) if desc_elem else ""
+
+        # Extract funnel steps/types, skipping the +1 indicators
+        funnel_steps = [step_text for elem in funnel_elems
+                        if (step_text := _element_text(elem)) and step_text != '+1']
+
+        # Extract effort hours (optional metadata)
+        effort_elem = field_elems.get('effort')
+        effort_hours = _parse_effort_hours(_element_text(effort_elem)) if effort_elem else None
+
+        # Extract impact level (optional metadata)
+        impact_elem = field_elems.get('impact')
+        impact = _element_text(impact_elem) if impact_elem else None
+
+        strategies.append(Strategy(
+            name=strategy_name,
+            description=description,
+            types=tuple(funnel_steps),
+            effort_hours=effort_hours,
+            impact=impact or None
+        ))
+
+    if skipped:
+        noun = 'container' if skipped == 1 else 'containers'
+        print(f"Skipped {skipped} strategy {noun} without a name")
+
     return strategies
 
 
@@ -100,8 +157,8 @@ def main():
         strategies = parse_marketing_strategies(html_file)
 
         # Save to JSON
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(strategies, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(json_dumps(strategies))
 
         print(f"Successfully parsed {len(strategies)} marketing strategies")
         print(f"Output saved to {output_file}")
@@ -109,7 +166,7 @@ def main():
         # Print sample of first strategy
         if strategies:
             print("\nSample strategy:")
-            print(json.dumps(strategies[0], indent=2, ensure_ascii=False))
+            print(json_dumps(strategies[0]).decode('utf-8'))
 
     except FileNotFoundError:
         print(f"Error: File '{html_file}' not found")
@@ -0,0 +1,90 @@
+"""
+Marketing Strategy
+Запись маркетинговой стратегии и чтение/запись JSON, общие для парсера и подборщика стратегий.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(slots=True)
+class Strategy:
+    """
+    Маркетинговая стратегия.
+    """
+
+    name: str
+    description: str
+    types: Tuple[str, ...]
+    effort_hours: Optional[int] = None
+    impact: Optional[str] = None
+    # Числовой ранг влияния, вычисляется при загрузке (в JSON не пишется)
+    impact_rank: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Strategy':
+        """Создает стратегию из словаря в формате marketing_strategies.json."""
+        return cls(
+            name=data['name'],
+            description=data.get('description', ''),
+            types=tuple(data.get('types', ())),
+            effort_hours=data.get('effort_hours'),
+            impact=data.get('impact')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает словарь в формате marketing_strategies.json."""
+        data = {
+            'name': self.name,
+            'description': self.description,
+            'types': list(self.types)
+        }
+
+        # Необязательные поля пишем, только если они заданы
+        if self.effort_hours is not None:
+            data['effort_hours'] = self.effort_hours
+        if self.impact:
+            data['impact'] = self.impact
+
+        return data
+
+
+def json_default(obj: Any) -> Any:
+    """Хук сериализации JSON для объектов Strategy."""
+    if isinstance(obj, Strategy):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Быстрая JSON-библиотека: orjson, затем ujson, затем стандартный json
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> bytes:
+        """Сериализует в UTF-8 JSON с отступами."""
+        return orjson.dumps(obj, default=json_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                            | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    json_loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    try:
+        import ujson
+
+        def json_dumps(obj: Any) -> bytes:
+            """Сериализует в UTF-8 JSON с отступами."""
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False,
+                               indent=2, default=json_default).encode('utf-8')
+
+        json_loads = ujson.loads
+        JSONDecodeError = ujson.JSONDecodeError
+    except ImportError:
+        def json_dumps(obj: Any) -> bytes:
+            """Сериализует в UTF-8 JSON с отступами."""
+            return json.dumps(obj, indent=2, ensure_ascii=False,
+                              default=json_default).encode('utf-8')
+
+        json_loads = json.loads
+        JSONDecodeError = json.JSONDecodeError
@@ -4,10 +4,12 @@ Marketing Strategy Picker для воронки продаж
 Подбирает подходящие маркетинговые стратегии для каждого этапа от гостя до клиента.
 """
 
-import json
 import random
+from itertools import groupby
+from operator import attrgetter, itemgetter
 from typing import Dict, List, Set, Optional
-from collections import defaultdict
+
+from marketing_strategy import JSONDecodeError, Strategy, json_dumps, json_loads
 
 
 class MarketingStrategyPicker:
@@ -55,32 +57,80 @@ class MarketingStrategyPicker:
         }
     }
 
+    # Этапы в порядке воронки (FUNNEL_STAGES не меняется, сортируем один раз)
+    FUNNEL_STAGES_ORDERED = tuple(sorted(FUNNEL_STAGES.items(), key=lambda x: x[1]['order']))
+
+    # Ключ этапа по его номеру в воронке
+    STAGE_KEY_BY_ORDER = {info['order']: key for key, info in FUNNEL_STAGES.items()}
+
+    # Числовой ранг уровня влияния для сортировки (неизвестный уровень - 0)
+    IMPACT_RANK = {
+        'Low': 1,
+        'Low to Moderate': 2,
+        'Moderate': 3,
+        'Moderate to High': 4,
+        'High': 5
+    }
+
     def __init__(self, json_file: str = 'marketing_strategies.json'):
         """Инициализация с загрузкой данных."""
+        self._stage_cache: Dict[str, List[Strategy]] = {}
+        self.load_strategies(json_file)
+
+    def load_strategies(self, json_file: str):
+        """(Пере)загружает стратегии и перестраивает производные структуры."""
         self.strategies = self._load_strategies(json_file)
         self.strategies_by_type = self._group_strategies_by_type()
+        self._sorted_by_type = self._sort_unique_by_type()
+        # Кэш этапов строится по _sorted_by_type, поэтому сбрасываем его
+        self._stage_cache.clear()
 
-    def _load_strategies(self, json_file: str) -> List[Dict]:
+    def _load_strategies(self, json_file: str) -> List[Strategy]:
         """Загружает стратегии из JSON файла."""
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(json_file, 'rb') as f:
+                strategies = [Strategy.from_dict(data) for data in json_loads(f.read())]
         except FileNotFoundError:
             print(f"Ошибка: файл {json_file} не найден")
             return []
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             print(f"Ошибка чтения JSON: {e}")
             return []
 
-    def _group_strategies_by_type(self) -> Dict[str, List[Dict]]:
+        # Ранг влияния вычисляем один раз при загрузке
+        for strategy in strategies:
+            strategy.impact_rank = self.IMPACT_RANK.get(strategy.impact, 0)
+        return strategies
+
+    def _group_strategies_by_type(self) -> Dict[str, List[Strategy]]:
         """Группирует стратегии по типам."""
-        grouped = defaultdict(list)
-        for strategy in self.strategies:
-            for strategy_type in strategy.get('types', []):
-                grouped[strategy_type].append(strategy)
-        return dict(grouped)
+        # Пары (тип, стратегия); сортировка стабильна, порядок внутри типа сохраняется
+        pairs = sorted(
+            ((strategy_type, strategy)
+             for strategy in self.strategies
+             for strategy_type in strategy.types),
+            key=itemgetter(0)
+        )
+        return {
+            strategy_type: [pair[1] for pair in group]
+            for strategy_type, group in groupby(pairs, key=itemgetter(0))
+        }
 
-    def get_strategies_for_stage(self, stage_key: str, limit: int = 10) -> List[Dict]:
+    def _sort_unique_by_type(self) -> Dict[str, List[Strategy]]:
+        """Убирает дубликаты по названию в каждом типе и сортирует по impact."""
+        sorted_by_type = {}
+        for strategy_type, strategies in self.strategies_by_type.items():
+            seen_names = set()
+            unique_strategies = []
+            for strategy in strategies:
+                if strategy.name not in seen_names:
+                    unique_strategies.append(strategy)
+                    seen_names.add(strategy.name)
+            unique_strategies.sort(key=attrgetter('impact_rank'), reverse=True)
+            sorted_by_type[strategy_type] = unique_strategies
+        return sorted_by_type
+
+    def get_strategies_for_stage(self, stage_key: str, limit: int = 10) -> List[Strategy]:
         """
         Получает стратегии для конкретного этапа воронки.
 
@@ -94,25 +144,23 @@ class MarketingStrategyPicker:
         if stage_key not in self.FUNNEL_STAGES:
             return []
 
-        stage_info = self.FUNNEL_STAGES[stage_key]
-        strategies = []
-
-        # Собираем стратегии по всем типам этапа
-        for strategy_type in stage_info['types']:
-            if strategy_type in self.strategies_by_type:
-                strategies.extend(self.strategies_by_type[strategy_type])
-
-        # Убираем дубликаты (стратегия может иметь несколько типов)
-        seen_names = set()
-        unique_strategies = []
-        for strategy in strategies:
-            if strategy['name'] not in seen_names:
-                unique_strategies.append(strategy)
-                seen_names.add(strategy['name'])
-
-        # Ограничиваем количество и сортируем по impact (если есть)
-        unique_strategies.sort(key=lambda x: x.get('impact', ''), reverse=True)
-        return unique_strategies[:limit]
+        # Полный отсортированный список этапа кэшируем, limit применяем к нему
+        if stage_key not in self._stage_cache:
+            stage_types = self.FUNNEL_STAGES[stage_key]['types']
+            if len(stage_types) == 1:
+                # Списки по типу уже без дубликатов и отсортированы
+                stage_strategies = self._sorted_by_type.get(stage_types[0], [])
+            else:
+                # Убираем дубликаты (стратегия может иметь несколько типов)
+                unique_strategies = {}
+                for strategy_type in stage_types:
+                    for strategy in self._sorted_by_type.get(strategy_type, []):
+                        unique_strategies.setdefault(strategy.name, strategy)
+                stage_strategies = sorted(unique_strategies.values(),
+                                          key=attrgetter('impact_rank'), reverse=True)
+            self._stage_cache[stage_key] = stage_strategies
+
+        return self._stage_cache[stage_key][:limit]
 
     def get_funnel_recommendations(self, selected_stages: Optional[List[str]] = None,
                                  strategies_per_stage: int = 5) -> Dict:
@@ -157,8 +205,7 @@ class MarketingStrategyPicker:
         print("🎯 ВОРОНКА ПРОДАЖ: от гостя до клиента\n")
         print("=" * 60)
 
-        for stage_key, stage_info in sorted(self.FUNNEL_STAGES.items(),
-                                          key=lambda x: x[1]['order']):
+        for stage_key, stage_info in self.FUNNEL_STAGES_ORDERED:
             count = len(self.strategies_by_type.get(stage_info['types'][0], []))
             print(f"{stage_info['order']}. {stage_info['name']}")
             print(f"   📝 {stage_info['description']}")
@@ -177,14 +224,14 @@ class MarketingStrategyPicker:
             print(f"📊 Найдено стратегий: {data['count']}\n")
 
             for i, strategy in enumerate(data['strategies'], 1):
-                print(f"   {i}. {strategy['name']}")
-                print(f"      💡 {strategy['description'][:100]}...")
+                print(f"   {i}. {strategy.name}")
+                print(f"      💡 {strategy.description:.100}...")
 
-                impact = strategy.get('impact')
+                impact = strategy.impact
                 if impact:
                     print(f"      📈 Влияние: {impact}")
 
-                effort = strategy.get('effort_hours')
+                effort = strategy.effort_hours
                 if effort:
                     print(f"      ⏱️  Усилий: {effort} часов")
 
@@ -197,8 +244,7 @@ class MarketingStrategyPicker:
         print("0. Все этапы")
         print()
 
-        for stage_key, stage_info in sorted(self.FUNNEL_STAGES.items(),
-                                          key=lambda x: x[1]['order']):
+        for stage_key, stage_info in self.FUNNEL_STAGES_ORDERED:
             count = len(self.strategies_by_type.get(stage_info['types'][0], []))
             print(f"{stage_info['order']}. {stage_info['name']} ({count} стратегий)")
             print(f"   {stage_info['description']}")
@@ -216,12 +262,8 @@ class MarketingStrategyPicker:
                     selected_stages = list(self.FUNNEL_STAGES.keys())
                 else:
                     selected_numbers = [int(x.strip()) for x in choice.split(',') if x.strip()]
-                    selected_stages = []
-                    for num in selected_numbers:
-                        for stage_key, stage_info in self.FUNNEL_STAGES.items():
-                            if stage_info['order'] == num:
-                                selected_stages.append(stage_key)
-                                break
+                    selected_stages = [self.STAGE_KEY_BY_ORDER[num] for num in selected_numbers
+                                       if num in self.STAGE_KEY_BY_ORDER]
 
                 if not selected_stages:
                     print("❌ Неверный выбор. Попробуйте снова.")
@@ -243,8 +285,8 @@ class MarketingStrategyPicker:
     def export_to_json(self, recommendations: Dict, filename: str = 'funnel_recommendations.json'):
         """Экспортирует рекомендации в JSON файл."""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(recommendations, f, indent=2, ensure_ascii=False)
+            with open(filename, 'wb') as f:
+                f.write(json_dumps(recommendations))
             print(f"✅ Рекомендации сохранены в файл: {filename}")
         except Exception as e:
             print(f"❌ Ошибка сохранения: {e}")